@@ -1,254 +1,734 @@
 import os
 import re
+import json
+import time
+import hashlib
+import itertools
+from collections import Counter
+from urllib.parse import urlsplit, urlunsplit
+import asyncio
+import diskcache
+import httpx
+import ijson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from openai import OpenAI
 import streamlit as st
-from bs4 import BeautifulSoup
+import lxml.html
 
 # --------------------------
 # API Key Handling
 # --------------------------
-api_key = None
-try:
-    api_key = st.secrets["EXA_API_KEY"]
-except Exception:
+# Streamlit reruns this script on every interaction, so clients/keys are resolved once per process
+@st.cache_resource
+def _get_client():
+    api_key = None
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        api_key = os.getenv("EXA_API_KEY")
-    except ImportError:
-        st.error("⚠️ python-dotenv not installed, and no Streamlit secret found.")
-
-if not api_key:
-    st.error("❌ No API key found. Please set EXA_API_KEY in .env or Streamlit secrets.")
-    st.stop()
+        api_key = st.secrets["EXA_API_KEY"]
+    except Exception:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+            api_key = os.getenv("EXA_API_KEY")
+        except ImportError:
+            raise RuntimeError("⚠️ python-dotenv not installed, and no Streamlit secret found.")
+    if not api_key:
+        raise RuntimeError("❌ No API key found. Please set EXA_API_KEY in .env or Streamlit secrets.")
+    return OpenAI(base_url="https://api.exa.ai", api_key=api_key)
 
-client = OpenAI(base_url="https://api.exa.ai", api_key=api_key)
 
-# Optional GitHub token
-GITHUB_TOKEN = None
 try:
-    GITHUB_TOKEN = st.secrets["GITHUB_TOKEN"]
-except Exception:
-    pass
+    client = _get_client()
+except RuntimeError as e:
+    st.error(str(e))
+    st.stop()
+
+
+@st.cache_data
+def _get_github_tokens():
+    tokens = []
+    for key in ["GITHUB_TOKEN"] + [f"GITHUB_TOKEN_{i}" for i in range(4)]:
+        try:
+            if st.secrets[key]:
+                tokens.append(st.secrets[key])
+        except Exception:
+            pass
+    return tokens
+
+
+# Optional GitHub token(s); extra GITHUB_TOKEN_0..3 secrets are rotated to spread the rate limit
+GITHUB_TOKENS = _get_github_tokens()
+_token_cycle = itertools.cycle(GITHUB_TOKENS)
+
+
+@st.cache_resource
+def _get_cache():
+    return diskcache.Cache(".gh_cache")
+
+
+@st.cache_resource
+def _get_rate_limits():
+    return {}
+
+
+# Longest we'll wait on a Retry-After header before retrying a GitHub call
+MAX_RETRY_AFTER = 60
+
+
+class _CappedRetry(Retry):
+    """urllib3 Retry that honors Retry-After but never sleeps longer than MAX_RETRY_AFTER."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_RETRY_AFTER)
+
+
+@st.cache_resource
+def _get_session():
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=50,
+        max_retries=_CappedRetry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            respect_retry_after_header=True,
+            allowed_methods=["GET", "HEAD"],
+            # Hand the final 429/5xx back as a response so callers treat it like any non-200
+            raise_on_status=False,
+        ),
+    ))
+    session.headers["User-Agent"] = "Mozilla/5.0 (compatible; CompanyInfoBot/1.0)"
+    return session
+
+
+# On-disk cache for GitHub API responses: (url, token fingerprint) -> (etag, body, expiry)
+cache = _get_cache()
+# Last seen (X-RateLimit-Remaining, X-RateLimit-Reset) per Authorization header (None = unauthenticated)
+RATE_LIMIT_REMAINING = _get_rate_limits()
+
+# Shared HTTP session so TCP/TLS connections are reused across calls and reruns
+SESSION = _get_session()
 
 # --------------------------
 # Utility Functions
 # --------------------------
-def extract_links(text, domains=None):
-    seen = set()
-    ordered = []
+_LINKS_RE = re.compile(r'\[[^\]]*?\]\((?P<md>https?://[^\s)]+)\)|(?P<bare>https?://[^\s\)\]\}\,\'"]+)')
+_GH_ORG_RE = re.compile(r'github\.com/([A-Za-z0-9_.-]+)', re.I)
+_GH_SITE_RE = re.compile(r'github\.com/([a-z0-9_.-]+)(?:/[a-z0-9_.-]+)?', re.I)
+# Emails, skipping noreply addresses inside the regex (lookbehind keeps matches from starting mid-address)
+_EMAIL_FILTERED_RE = re.compile(
+    r"(?<![A-Za-z0-9._%+-])"
+    r"(?![A-Za-z0-9._%+-]*noreply|[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]*noreply)"
+    r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}"
+)
+_LINKEDIN_RE = re.compile(r"(https?://[^\s]+linkedin\.com[^\s]*)", re.I)
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# GitHub account names: alphanumerics and hyphens, no leading/trailing hyphen, max 39 chars
+_GH_NAME_RE = re.compile(r'[A-Za-z0-9](?:[A-Za-z0-9-]{0,37}[A-Za-z0-9])?')
+
+# First path segments on github.com that are site pages, never organizations
+_RESERVED_GH = frozenset({
+    'settings', 'login', 'features', 'topics', 'marketplace', 'about', 'pricing',
+    'enterprise', 'collections', 'trending', 'explore', 'readme', 'security',
+    'sponsors', 'notifications', 'issues', 'pulls', 'codespaces', 'discussions',
+    'apps', 'orgs',
+})
+
+# Name/URL tokens that say nothing about which org is the company's
+_NAME_STOPWORDS = frozenset({
+    'the', 'a', 'an', 'of', 'and', 'for', 'http', 'https', 'www', 'com', 'org', 'net',
+    'io', 'xyz', 'co', 'ai', 'app', 'dev', 'finance', 'protocol', 'labs', 'network',
+    'foundation', 'project', 'official', 'dao', 'inc', 'ltd',
+})
+# What may follow the company's main token in its own org name (e.g. uniswap-labs, aavegotchi-dao)
+_ORG_SUFFIXES = frozenset({
+    'protocol', 'labs', 'network', 'foundation', 'finance', 'dao', 'hq', 'team',
+    'official', 'org', 'io', 'xyz', 'app', 'dev', 'eth',
+})
+# Name score at which a verified LLM org is trusted without scraping the website
+CONFIDENT_NAME_SCORE = 9
 
-    def add(url):
-        u = url.strip().rstrip(").,]>'\"")
-        if u and u not in seen:
-            seen.add(u)
-            ordered.append(u)
 
-    for m in re.finditer(r'\[([^\]]*?)\]\((https?://[^\s)]+)\)', text):
-        add(m.group(2))
-    for m in re.finditer(r'https?://[^\s\)\]\}\,\'"]+', text):
-        add(m.group(0))
+def extract_links(text, domains=None):
+    ordered = {}
+    for m in _LINKS_RE.finditer(text):
+        u = (m.group("md") or m.group("bare")).strip().rstrip(").,]>'\"")
+        if u:
+            ordered[u] = None
 
     if domains:
         domains = [d.lower() for d in domains]
         return [u for u in ordered if any(d in u.lower() for d in domains)]
-    return ordered
+    return list(ordered)
 
 
-def query_exa(prompt):
+@st.cache_data(ttl=3600, show_spinner=False)
+def query_exa(prompt, json_mode=False):
+    extra = {"response_format": {"type": "json_object"}} if json_mode else {}
     completion = client.chat.completions.create(
         model="exa",
         messages=[{"role": "user", "content": prompt}],
+        **extra,
     )
     return completion.choices[0].message.content.strip()
 
 
+def next_github_token():
+    """Round-robin over the configured GitHub tokens (None when unauthenticated)."""
+    return next(_token_cycle, None)
+
+
 def get_org_from_github_url(url):
-    m = re.search(r'github\.com/([A-Za-z0-9_.-]+)', url, flags=re.I)
+    m = _GH_ORG_RE.search(url)
     return m.group(1) if m else None
 
 
 def extract_emails_from_text(text):
-    return re.findall(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", text)
+    return _EMAIL_FILTERED_RE.findall(text)
 
 
+@st.cache_data(ttl=86400, show_spinner=False)
 def scrape_github_profile_for_contacts(username):
-    """Scrape LinkedIn + emails from profile HTML."""
+    """Scrape LinkedIn + emails from profile HTML.
+
+    Raises on anything but a 200 or 404 so transient failures aren't cached.
+    """
     url = f"https://github.com/{username}"
-    try:
-        headers = {"User-Agent": "Mozilla/5.0"}
-        r = requests.get(url, headers=headers, timeout=10)
-        if r.status_code != 200:
-            return None, None
-
-        linkedin = None
-        email = None
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        for a in soup.find_all("a", href=True):
-            href = a["href"].strip()
-            if "linkedin.com" in href.lower():
-                linkedin = href if href.startswith("http") else "https://" + href.lstrip("/")
-            if href.lower().startswith("mailto:"):
-                email = href.replace("mailto:", "").strip()
-
-        if not email:
-            text = soup.get_text(" ")
-            emails = extract_emails_from_text(text)
-            if emails:
-                email = emails[0]
-
-        return linkedin, email
-    except Exception:
+    headers = {"User-Agent": "Mozilla/5.0"}
+    r = SESSION.get(url, headers=headers, timeout=10)
+    if r.status_code == 404 or (r.status_code == 200 and not r.text.strip()):
         return None, None
+    if r.status_code != 200:
+        raise requests.HTTPError(f"{r.status_code} for {url}", response=r)
+
+    linkedin = None
+    email = None
+    tree = lxml.html.fromstring(r.text)
+
+    for href in tree.xpath("//a/@href"):
+        href = href.strip()
+        if "linkedin.com" in href.lower():
+            linkedin = href if href.startswith("http") else "https://" + href.lstrip("/")
+        if href.lower().startswith("mailto:"):
+            email = href.replace("mailto:", "").strip()
+
+    if not email:
+        # Emails aren't split across tags in profile markup, so scan the raw HTML
+        emails = [
+            e for e in extract_emails_from_text(r.text)
+            if not e.endswith((".png", ".svg", ".jpg"))
+        ]
+        if emails:
+            email = emails[0]
+
+    return linkedin, email
+
+
+def _cache_key(url, headers=None):
+    """Cache key for url as seen by the Authorization in headers (responses vary by token)."""
+    auth = (headers or {}).get("Authorization")
+    return (url, hashlib.sha256(auth.encode()).hexdigest()[:16] if auth else None)
+
+
+def _cache_lookup(key):
+    """Return (entry, fresh) for a cached GitHub API key."""
+    entry = cache.get(key)
+    return entry, entry is not None and entry[2] > time.time()
+
+
+def _record_rate_limit(resp):
+    """Remember the REST core (remaining, reset epoch) for the token that sent resp."""
+    remaining = resp.headers.get("X-RateLimit-Remaining")
+    reset = resp.headers.get("X-RateLimit-Reset")
+    # GraphQL and search have their own budgets; only core governs the per-user fan-out
+    if remaining is None or reset is None or resp.headers.get("X-RateLimit-Resource", "core") != "core":
+        return
+    RATE_LIMIT_REMAINING[resp.request.headers.get("Authorization")] = (int(remaining), int(reset))
+
+
+def rate_limit_remaining(authorization):
+    """Last seen remaining core quota for an Authorization header, or None if unknown or past its reset."""
+    remaining, reset = RATE_LIMIT_REMAINING.get(authorization, (None, 0))
+    return remaining if time.time() < reset else None
+
+
+def _cache_update(key, entry, resp, ttl):
+    """Store a 200 (or refresh a 304) response in the cache and return its body."""
+    _record_rate_limit(resp)
+    if resp.status_code == 304 and entry:
+        cache.set(key, (entry[0], entry[1], time.time() + ttl))
+        return entry[1]
+    if resp.status_code != 200:
+        return None
+    body = resp.json()
+    cache.set(key, (resp.headers.get("ETag"), body, time.time() + ttl))
+    return body
 
 
-def get_email_from_events(username, headers):
-    """Try to extract email from recent public GitHub events."""
-    try:
-        r = requests.get(f"https://api.github.com/users/{username}/events/public", headers=headers, timeout=10)
-        if r.status_code != 200:
+GITHUB_API_HEADERS = {"Accept": "application/vnd.github+json"}
+
+
+def _conditional_headers(headers, entry):
+    headers = {**GITHUB_API_HEADERS, **(headers or {})}
+    if entry and entry[0]:
+        headers["If-None-Match"] = entry[0]
+    return headers
+
+
+def cached_get(url, headers=None, ttl=3600):
+    """GET a GitHub API url, serving fresh hits from disk and revalidating stale ones via ETag."""
+    key = _cache_key(url, headers)
+    entry, fresh = _cache_lookup(key)
+    if fresh:
+        return entry[1]
+    r = SESSION.get(url, headers=_conditional_headers(headers, entry), timeout=10)
+    return _cache_update(key, entry, r, ttl)
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def get_email_from_events(username, _token=None):
+    """Try to extract email from recent public GitHub events.
+
+    Raises on anything but a 200 or 404 so a rate-limited token doesn't cache a miss.
+    """
+    headers = dict(GITHUB_API_HEADERS)
+    if _token:
+        headers["Authorization"] = f"token {_token}"
+    url = f"https://api.github.com/users/{username}/events/public"
+    with SESSION.get(url, headers=headers, timeout=10, stream=True) as r:
+        if r.status_code == 404:
             return None
-        events = r.json()
-        for e in events:
+        if r.status_code != 200:
+            raise requests.HTTPError(f"{r.status_code} for {url}", response=r)
+        # Parse events one at a time and stop reading at the first usable email
+        r.raw.decode_content = True
+        for e in ijson.items(r.raw, "item"):
             if e.get("type") == "PushEvent":
                 commits = e.get("payload", {}).get("commits", [])
                 for c in commits:
                     email = c.get("author", {}).get("email")
                     if email and "noreply" not in email:
                         return email
-        return None
-    except Exception:
-        return None
+    return None
 
 
-def get_github_members(github_url, token=None):
+# Cap on in-flight requests per fan-out, to stay clear of GitHub's secondary rate limits
+GITHUB_CONCURRENCY = 20
+
+
+def github_async_client():
+    """HTTP/2 client for api.github.com, shared by one search; auth is passed per request."""
+    return httpx.AsyncClient(
+        base_url="https://api.github.com",
+        http2=True,
+        headers=GITHUB_API_HEADERS,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=GITHUB_CONCURRENCY),
+        timeout=8,
+    )
+
+
+async def _request_with_retry(client, method, url, retries=3, **kwargs):
+    """Send an httpx request, waiting out 403/429 rate limits via Retry-After or exponential backoff."""
+    for attempt in range(retries):
+        r = await client.request(method, url, **kwargs)
+        _record_rate_limit(r)
+        if r.status_code not in (403, 429):
+            return r
+        retry_after = r.headers.get("Retry-After")
+        if r.status_code == 403 and retry_after is None:
+            return r  # plain permission error or exhausted primary limit
+        delay = float(retry_after) if retry_after and retry_after.isdigit() else 0.5 * 2 ** attempt
+        await asyncio.sleep(min(delay, MAX_RETRY_AFTER))
+    r = await client.request(method, url, **kwargs)
+    _record_rate_limit(r)
+    return r
+
+
+async def _fetch_member(client, login, sem, headers=None, ttl=3600):
+    """Fetch the /users/{login} details for one org member."""
+    key = _cache_key(f"https://api.github.com/users/{login}", headers)
+    entry, fresh = _cache_lookup(key)
+    if fresh:
+        return entry[1]
+    async with sem:
+        r = await _request_with_retry(client, "GET", f"/users/{login}", headers=_conditional_headers(headers, entry))
+    return _cache_update(key, entry, r, ttl)
+
+
+MEMBERS_QUERY = """
+query($org: String!) {
+  organization(login: $org) {
+    membersWithRole(first: 100) {
+      nodes { login name url twitterUsername email bio websiteUrl }
+    }
+  }
+}
+"""
+
+
+async def _fetch_members_graphql(client, org, headers, ttl=3600):
+    """Fetch details for all org members in one GraphQL call, shaped like /users/{login} bodies.
+
+    Returns None on any failure (transport error, GraphQL errors, missing read:org) so callers fall back to REST.
+    """
+    key = _cache_key(f"members-graphql:{org.lower()}", headers)
+    users = cache.get(key)
+    if users is not None:
+        return users
+    try:
+        r = await _request_with_retry(
+            client, "POST", "/graphql", headers=headers, json={"query": MEMBERS_QUERY, "variables": {"org": org}}
+        )
+        payload = r.json() if r.status_code == 200 else {}
+    except (httpx.HTTPError, ValueError):
+        return None
+    # Partial results (e.g. membersWithRole: null with INSUFFICIENT_SCOPES) come back alongside "errors"
+    if not isinstance(payload, dict) or payload.get("errors"):
+        return None
+    organization = (payload.get("data") or {}).get("organization") or {}
+    nodes = (organization.get("membersWithRole") or {}).get("nodes")
+    if nodes is None:
+        return None
+    users = [
+        {
+            "login": n["login"],
+            "name": n.get("name"),
+            "html_url": n.get("url"),
+            "twitter_username": n.get("twitterUsername"),
+            "email": n.get("email") or None,
+            "bio": n.get("bio"),
+            "blog": n.get("websiteUrl"),
+        }
+        for n in nodes
+        if n and n.get("login")
+    ]
+    cache.set(key, users, expire=ttl)
+    return users
+
+
+MAX_MEMBERS = 100
+
+
+def _minimal_member(item):
+    """Member entry built from the /orgs/{org}/members list alone, without per-user details."""
+    return {
+        "login": item["login"],
+        "name": None,
+        "url": item.get("html_url"),
+        "x": None,
+        "email": None,
+        "blog": None,
+        "linkedin": None
+    }
+
+
+async def _build_member(ud, token, sem):
+    """Turn a /users/{login} body into a member entry, scraping the profile and events only when needed."""
+    login = ud["login"]
+
+    twitter = ud.get("twitter_username")
+    twitter_url = f"https://x.com/{twitter}" if twitter else None
+    blog = ud.get("blog") or None
+    email = ud.get("email")  # ✅ Direct from GitHub API
+    bio = ud.get("bio") or ""
+    bio_l = bio.lower()
+    blog_l = blog.lower() if blog else ""
+
+    # If API didn't return email, check inside bio
+    if not email:
+        email_match = _EMAIL_FILTERED_RE.search(bio)
+        if email_match:
+            email = email_match.group(0)
+
+    # Try LinkedIn in bio/blog
+    linkedin_link = None
+    if "linkedin.com" in bio_l:
+        linkedin_match = _LINKEDIN_RE.search(bio)
+        if linkedin_match:
+            linkedin_link = linkedin_match.group(1)
+    if not linkedin_link and "linkedin.com" in blog_l:
+        linkedin_link = blog
+
+    # Final fallback: scrape GitHub profile page
+    if not linkedin_link or not email:
+        try:
+            async with sem:
+                scraped_linkedin, scraped_email = await asyncio.to_thread(scrape_github_profile_for_contacts, login)
+        except Exception:
+            scraped_linkedin, scraped_email = None, None
+        if not linkedin_link and scraped_linkedin:
+            linkedin_link = scraped_linkedin
+        if not email and scraped_email:
+            email = scraped_email
+
+    # Last chance: look inside commit history via events API
+    # (authenticated only: unauthenticated runs can't spare the rate limit)
+    if not email and token:
+        try:
+            async with sem:
+                email_from_events = await asyncio.to_thread(get_email_from_events, login, token)
+        except Exception:
+            email_from_events = None
+        if email_from_events:
+            email = email_from_events
+
+    return {
+        "login": login,
+        "name": ud.get("name"),
+        "url": ud.get("html_url"),
+        "x": twitter_url,
+        "email": email,
+        "blog": blog if blog and "linkedin.com" not in blog_l else None,
+        "linkedin": linkedin_link
+    }
+
+
+async def get_github_members(github_url, client, sem, token=None, detailed=None):
     org = get_org_from_github_url(github_url)
     if not org:
         return []
+    detailed = (token is not None) if detailed is None else detailed
     headers = {"Authorization": f"token {token}"} if token else {}
     try:
-        r = requests.get(f"https://api.github.com/orgs/{org}/members", headers=headers, timeout=10)
-        if r.status_code != 200:
-            return []
-        members = []
-        for item in r.json():
-            login = item.get("login")
-            if not login:
-                continue
-
-            # Get user details
-            ures = requests.get(f"https://api.github.com/users/{login}", headers=headers, timeout=8)
-            if ures.status_code == 200:
-                ud = ures.json()
-
-                twitter = ud.get("twitter_username")
-                twitter_url = f"https://x.com/{twitter}" if twitter else None
-                blog = ud.get("blog") or None
-                email = ud.get("email")  # ✅ Direct from GitHub API
-                bio = ud.get("bio") or ""
-
-                # If API didn't return email, check inside bio
-                if not email:
-                    email_match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", bio)
-                    if email_match:
-                        email = email_match.group(0)
-
-                # Try LinkedIn in bio/blog
-                linkedin_link = None
-                if "linkedin.com" in bio.lower():
-                    linkedin_match = re.search(r"(https?://[^\s]+linkedin\.com[^\s]*)", bio, re.I)
-                    if linkedin_match:
-                        linkedin_link = linkedin_match.group(1)
-                if not linkedin_link and blog and "linkedin.com" in blog.lower():
-                    linkedin_link = blog
-
-                # Final fallback: scrape GitHub profile page
-                if not linkedin_link or not email:
-                    scraped_linkedin, scraped_email = scrape_github_profile_for_contacts(login)
-                    if not linkedin_link and scraped_linkedin:
-                        linkedin_link = scraped_linkedin
-                    if not email and scraped_email:
-                        email = scraped_email
-
-                # Last chance: look inside commit history via events API
-                if not email:
-                    email_from_events = get_email_from_events(login, headers)
-                    if email_from_events:
-                        email = email_from_events
-
-                members.append({
-                    "login": login,
-                    "name": ud.get("name"),
-                    "url": ud.get("html_url"),
-                    "x": twitter_url,
-                    "email": email,
-                    "blog": blog if blog and "linkedin.com" not in (blog.lower()) else None,
-                    "linkedin": linkedin_link
-                })
-        return members
+        # GraphQL needs a token; it returns every member's details in one request
+        users = await _fetch_members_graphql(client, org, headers) if token and detailed else None
+        if users is None:
+            data = await asyncio.to_thread(
+                cached_get, f"https://api.github.com/orgs/{org}/members?per_page=100", headers
+            )
+            if data is None:
+                return []
+            data = [item for item in data if item.get("login")][:MAX_MEMBERS]
+            if not detailed:
+                return [_minimal_member(item) for item in data]
+
+            # Not enough rate limit left for the per-user fan-out: keep what the list gave us.
+            # Members whose /users body is still fresh on disk cost nothing, so don't count them.
+            remaining = rate_limit_remaining(headers.get("Authorization"))
+            uncached = sum(
+                1 for m in data
+                if not _cache_lookup(_cache_key(f"https://api.github.com/users/{m['login']}", headers))[1]
+            )
+            if remaining is not None and remaining < uncached + 5:
+                return [_minimal_member(item) for item in data]
+
+            # Get user details for all members concurrently
+            results = await asyncio.gather(
+                *[_fetch_member(client, m["login"], sem, headers) for m in data],
+                return_exceptions=True,
+            )
+            users = [ud for ud in results if isinstance(ud, dict)]
+
+        return list(await asyncio.gather(*[_build_member(ud, token, sem) for ud in users]))
     except Exception as e:
         st.error(f"⚠️ GitHub members fetch failed: {e}")
         return []
 
 
+MAX_SITE_BYTES = 512 * 1024
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
 def extract_githubs_from_site(site_url):
-    try:
-        if site_url.startswith("//"):
-            site_url = "https:" + site_url
-        if not site_url.startswith("http"):
-            site_url = "https://" + site_url.lstrip("/")
-        headers = {"User-Agent": "Mozilla/5.0 (compatible; CompanyInfoBot/1.0)"}
-        r = requests.get(site_url, headers=headers, timeout=8)
+    # Raises on anything but a 200 or 404 so transient failures aren't cached
+    parts = urlsplit(site_url, scheme="https")
+    if not parts.netloc:
+        parts = urlsplit("https://" + site_url.lstrip("/"), scheme="https")
+    site_url = urlunsplit(parts)
+    with SESSION.get(site_url, timeout=8, stream=True) as r:
+        if r.status_code == 404:
+            return Counter()
         if r.status_code != 200:
-            return {}
-        html = r.text.lower()
-        matches = re.findall(r'github\.com/([a-z0-9_.-]+)(?:/[a-z0-9_.-]+)?', html, flags=re.I)
-        counts = {}
-        for org in matches:
-            org = org.strip().lower()
-            if not org:
-                continue
-            counts[org] = counts.get(org, 0) + 1
-        return counts
-    except Exception:
-        return {}
+            raise requests.HTTPError(f"{r.status_code} for {site_url}", response=r)
+        html = r.raw.read(MAX_SITE_BYTES, decode_content=True).decode("utf-8", "ignore")
+    return Counter(org.lower() for org in _GH_SITE_RE.findall(html))
+
+
+def company_tokens(company_name):
+    """Distinctive tokens of a project name or website, the main (registrable domain) token first."""
+    name = (company_name or "").strip().lower()
+    if "." in name and " " not in name:
+        # URL or bare domain: keep the host labels minus www and the TLD
+        labels = (urlsplit(name if "//" in name else "https://" + name).hostname or "").split(".")
+        labels = [label for label in labels if label != "www"][:-1]
+        name = " ".join(labels[-1:] + labels[:-1])
+    tokens = [tok for tok in _TOKEN_RE.findall(name) if len(tok) > 1 and tok not in _NAME_STOPWORDS]
+    return list(dict.fromkeys(tokens))
+
+
+def _name_score(org, tokens, company):
+    """How strongly an org name matches the company's tokens (company = its name with separators removed)."""
+    hits = sum(1 for tok in tokens if tok in org)
+    return (5 if hits or (len(org) > 2 and org in company) else 0) + hits * 2
+
+
+def is_confident_org(org, company_name):
+    """True when org is clearly named after the company, not just sharing a common word with it."""
+    tokens = company_tokens(company_name)
+    if not tokens:
+        return False
+    org = org.lower()
+    main = tokens[0]
+    if org.startswith(main):
+        # The prefix alone is not enough: graphql is not "The Graph", basecamp is not "Base"
+        rest = org[len(main):].strip("-")
+        if not rest or rest in _ORG_SUFFIXES or rest in tokens:
+            return True
+    company = "".join(_TOKEN_RE.findall((company_name or "").lower()))
+    return _name_score(org, tokens, company) >= CONFIDENT_NAME_SCORE
 
 
 def choose_best_org_from_site(counts_dict, company_name):
-    if not counts_dict:
-        return None
-    company = (company_name or "").lower()
-    tokens = re.findall(r'[a-z0-9]+', company)
-    best = None
-    best_score = -1
-    for org, count in counts_dict.items():
-        score = count
-        if org in company or any(tok and tok in org for tok in tokens):
-            score += 5
-        overlap = sum(1 for tok in tokens if tok and tok in org)
-        score += overlap * 2
-        if score > best_score:
-            best_score = score
-            best = org
-    if best:
-        return f"https://github.com/{best}"
-    return None
+    tokens = company_tokens(company_name)
+    company = "".join(_TOKEN_RE.findall((company_name or "").lower()))
 
+    def score(item):
+        org, count = item
+        return count + _name_score(org, tokens, company)
 
-def filter_github_orgs(urls, token=None):
-    """Return only valid GitHub organizations."""
-    valid_orgs = []
+    best = max(counts_dict.items(), key=score, default=None)
+    return f"https://github.com/{best[0]}" if best else None
+
+
+async def github_org_exists(client, org, token=None, ttl=3600):
+    """HEAD /orgs/{org}; the status code is all we need, so skip the JSON body."""
+    token = token or next_github_token()
     headers = {"Authorization": f"token {token}"} if token else {}
-    for url in urls:
-        org = get_org_from_github_url(url)
-        if not org:
-            continue
-        r = requests.get(f"https://api.github.com/orgs/{org}", headers=headers, timeout=8)
-        if r.status_code == 200:
-            valid_orgs.append(f"https://github.com/{org}")
-    return valid_orgs
+    key = _cache_key(f"org-head:{org.lower()}", headers)
+    entry, fresh = _cache_lookup(key)
+    if fresh:
+        return entry[1]
+    try:
+        r = await _request_with_retry(client, "HEAD", f"/orgs/{org}", headers=_conditional_headers(headers, entry))
+    except httpx.HTTPError:
+        return False
+    if r.status_code == 304 and entry:
+        exists = entry[1]
+    elif r.status_code in (200, 404):
+        exists = r.status_code == 200
+    else:
+        return False
+    cache.set(key, (r.headers.get("ETag") or (entry and entry[0]), exists, time.time() + ttl))
+    return exists
+
+
+async def filter_github_orgs(urls, client, sem, token=None):
+    """Return only valid GitHub organizations."""
+    # Canonicalize first so case/path variants of one org cost a single check
+    orgs = list(dict.fromkeys(org.lower() for org in map(get_org_from_github_url, urls) if org))
+    # Drop GitHub site pages and impossible names before spending a request on them
+    orgs = [org for org in orgs if org not in _RESERVED_GH and _GH_NAME_RE.fullmatch(org)]
+    if not orgs:
+        return []
+
+    async def check(org):
+        async with sem:
+            return await github_org_exists(client, org, token)
+
+    exists = await asyncio.gather(*[check(org) for org in orgs])
+    return [f"https://github.com/{org}" for org, ok in zip(orgs, exists) if ok]
+
+# --------------------------
+# Search Pipeline
+# --------------------------
+async def query_sections(company_name):
+    """Ask Exa for the Website/LinkedIn/GitHub sections, batched into one call when possible."""
+    prompt = (
+        f"For the Web3/blockchain project {company_name}, return a JSON object with keys "
+        '"website" (the official main website link), '
+        '"linkedin" (the official LinkedIn page link(s)) and '
+        '"github" (the official GitHub organization or repositories link(s)). '
+        "Return only the JSON object."
+    )
+    try:
+        answer = json.loads(await asyncio.to_thread(query_exa, prompt, True))
+    except Exception:
+        answer = {}
+    if not isinstance(answer, dict):
+        answer = {}
+    # Unwrap a single wrapper object such as {"result": {...}}
+    if len(answer) == 1 and isinstance(next(iter(answer.values())), dict):
+        answer = next(iter(answer.values()))
+    answer = {str(k).lower(): v for k, v in answer.items()}
+
+    report_sections = {}
+    for sec in ("Website", "LinkedIn", "GitHub"):
+        value = answer.get(sec.lower()) or ""
+        report_sections[sec] = " ".join(map(str, value)) if isinstance(value, list) else str(value)
+    if any(v.strip() for v in report_sections.values()):
+        return report_sections
+
+    # Fall back to one query per section, run concurrently
+    queries = {
+        "Website": f"Find the official main website for the Web3/blockchain project {company_name}. Return only the link.",
+        "LinkedIn": f"Find the official LinkedIn page for {company_name}. Return only the link(s).",
+        "GitHub": f"Find the official GitHub organization or repositories for {company_name}. Return only the link(s)."
+    }
+    results = await asyncio.gather(
+        *[asyncio.to_thread(query_exa, q) for q in queries.values()],
+        return_exceptions=True,
+    )
+    for sec, res in zip(queries, results):
+        report_sections[sec] = res if isinstance(res, str) else ""
+    return report_sections
+
+
+async def run_search(company_name, detailed=None):
+    """Run the full lookup for one company and return everything the UI renders."""
+    # One client and one request budget for every GitHub call in this search
+    async with github_async_client() as client:
+        return await _run_search(company_name, client, asyncio.Semaphore(GITHUB_CONCURRENCY), detailed)
+
+
+async def _run_search(company_name, client, sem, detailed=None):
+    report_sections = await query_sections(company_name)
+
+    website_links = extract_links(report_sections.get("Website", ""))
+    website_url = website_links[0] if website_links else None
+
+    llm_githubs = extract_links(report_sections.get("GitHub", ""), ["github.com"])
+    linkedin_links = extract_links(report_sections.get("LinkedIn", ""), ["linkedin.com"])
+
+    # ---------------- GitHub Link Selection ----------------
+    # Verify the LLM's suggestions first; a hit named after the company skips the site scrape
+    valid_llm = await filter_github_orgs(llm_githubs, client, sem)
+    top_org = get_org_from_github_url(valid_llm[0]) if valid_llm else ""
+    if top_org and is_confident_org(top_org, company_name):
+        chosen_githubs = valid_llm
+        source = "llm"
+    else:
+        # Best-scoring site org first; filter_github_orgs dedupes while keeping this order
+        site_githubs = []
+        if website_url:
+            try:
+                site_counts = await asyncio.to_thread(extract_githubs_from_site, website_url)
+            except Exception:
+                site_counts = Counter()
+            best_site_org_url = choose_best_org_from_site(site_counts, company_name)
+            if best_site_org_url:
+                site_githubs.append(best_site_org_url)
+            site_githubs.extend(f"https://github.com/{org}" for org in site_counts)
+
+        # Filter only valid GitHub organizations
+        valid_site = await filter_github_orgs(site_githubs, client, sem)
+        chosen_githubs = list(dict.fromkeys(valid_site + valid_llm))
+        source = "site" if valid_site else "llm"
+
+    # ---------------- Members (one fetch per org, all orgs concurrently) ----------------
+    results = await asyncio.gather(
+        *[get_github_members(link, client, sem, token=next_github_token(), detailed=detailed) for link in chosen_githubs]
+    )
+
+    return {
+        "website_url": website_url,
+        "linkedin_links": linkedin_links,
+        "githubs": chosen_githubs,
+        "githubs_source": source,
+        "members": dict(zip(chosen_githubs, results)),
+    }
 
 # --------------------------
 # Streamlit UI
@@ -256,47 +736,17 @@ def filter_github_orgs(urls, token=None):
 st.title("🏢 Company Info")
 
 company_name = st.text_input("Enter Web3/Blockchain project name or website:")
+detailed = st.checkbox("Fetch per-user details", value=bool(GITHUB_TOKENS))
 
 if st.button("Search"):
     if not company_name.strip():
         st.warning("Please enter a project name or website.")
     else:
         with st.spinner("🔍 Searching..."):
-            queries = {
-                "Website": f"Find the official main website for the Web3/blockchain project {company_name}. Return only the link.",
-                "LinkedIn": f"Find the official LinkedIn page for {company_name}. Return only the link(s).",
-                "GitHub": f"Find the official GitHub organization or repositories for {company_name}. Return only the link(s)."
-            }
-            
-            report_sections = {}
-            for sec, q in queries.items():
-                try:
-                    report_sections[sec] = query_exa(q)
-                except Exception:
-                    report_sections[sec] = ""
-
-            website_links = extract_links(report_sections.get("Website", ""))
-            website_url = website_links[0] if website_links else None
-
-            llm_githubs = extract_links(report_sections.get("GitHub", ""), ["github.com"])
-            linkedin_links = extract_links(report_sections.get("LinkedIn", ""), ["linkedin.com"])
-
-            # ---------------- GitHub Link Selection ----------------
-            chosen_githubs = set()
-
-            if website_url:
-                site_counts = extract_githubs_from_site(website_url)
-                best_site_org_url = choose_best_org_from_site(site_counts, company_name)
-                if best_site_org_url:
-                    chosen_githubs.add(best_site_org_url)
-                for org in site_counts.keys():
-                    chosen_githubs.add(f"https://github.com/{org}")
-
-            for g in llm_githubs:
-                chosen_githubs.add(g)
-
-            # Filter only valid GitHub organizations
-            chosen_githubs = filter_github_orgs(list(chosen_githubs), token=GITHUB_TOKEN)
+            result = asyncio.run(run_search(company_name, detailed))
+            website_url = result["website_url"]
+            linkedin_links = result["linkedin_links"]
+            chosen_githubs = result["githubs"]
 
             # ---------------- Output ----------------
             st.subheader("🏢 Company Info")
@@ -306,13 +756,13 @@ if st.button("Search"):
             if chosen_githubs:
                 github_links_md = " | ".join([f"[{g}]({g})" for g in chosen_githubs])
                 st.markdown(f"**GitHub:** {github_links_md}")
+                st.caption("Found via " + ("the company website" if result["githubs_source"] == "site" else "Exa search"))
             else:
                 st.markdown("**GitHub:** None")
 
             if chosen_githubs:
                 st.subheader("👥 GitHub Members:")
-                for idx, link in enumerate(chosen_githubs, start=1):
-                    members = get_github_members(link, token=GITHUB_TOKEN)
+                for link, members in result["members"].items():
                     if not members:
                         st.markdown(f"**No members found for [{link}]({link})**")
                         continue